@@ -7,6 +7,19 @@ struct Detection
     double x, y, w, h;   // normalised
 };
 
+struct Box              // corner form, extracted once per frame for the cost loop
+{
+    double x1, y1, x2, y2;
+    double cx, cy;       // centre
+    double area;         // w*h, computed once instead of per pair
+};
+
+struct Edge             // a (track, detection) pair that passed gating
+{
+    int    t, d;
+    double cost;
+};
+
 struct Track
 {
     int             id          = -1;
@@ -39,12 +52,15 @@ public:
 
 private:
     // ─── helpers (implemented in Tracker.cpp) ────────────────────────
-    static double centre_dist(const Detection& d, const Track& t);
-    static double iou(const Track& t, const Detection& d);
+    static Box    to_box(double x, double y, double w, double h);
+    static double centre_dist(const Box& a, const Box& b);
+    static double iou(const Box& a, const Box& b);
     static cv::Mat det2meas(const Detection& d);
     static void    set_F(cv::KalmanFilter& kf, double dt);
     static void    set_Q(cv::KalmanFilter& kf, double dt, double s = 1e-2);
     static cv::KalmanFilter create_kf(const Detection& d);
+    void assign_components(int nT, int nD,
+                           std::vector<int>& tr2det, std::vector<int>& det2tr);
 
     // ─── data ───────────────────────────────────────────────────────
     double max_dist_, alpha_;
@@ -52,4 +68,12 @@ private:
     int    next_id_;
     std::vector<Track>  tracks_;
     std::vector<Label>  labels_;      // reused every frame
+
+    // per-frame association scratch, also reused so that steady-state
+    // frames do not allocate; cost_ only ever grows
+    std::vector<Box>    tbox_, dbox_;
+    std::vector<Edge>   edges_;
+    std::vector<int>    parent_, row_of_, col_of_, rows_, cols_, assign_;
+    std::vector<std::vector<int>>    comp_;
+    std::vector<std::vector<double>> cost_;
 };
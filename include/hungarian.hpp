@@ -4,20 +4,25 @@
 #include <limits>
 #include <algorithm>
 
+// n < 0: solve the whole matrix; otherwise only its top-left n×n block,
+// so callers can keep one oversized buffer alive across calls.
 inline int hungarian(const std::vector<std::vector<double>>& cost,
                      std::vector<int>& rowsol,
-                     double& total_cost)
+                     double& total_cost,
+                     int n = -1)
 {
-    int n = cost.size();
+    if(n < 0) n = cost.size();
     rowsol.assign(n, -1);
     std::vector<double> u(n+1), v(n+1);
     std::vector<int> p(n+1), way(n+1);
+    std::vector<double> minv(n+1);
+    std::vector<char> used(n+1);
 
     for(int i=1;i<=n;++i){
         p[0] = i;
         int j0 = 0;
-        std::vector<double> minv(n+1, std::numeric_limits<double>::infinity());
-        std::vector<char> used(n+1, false);
+        std::fill(minv.begin(), minv.end(), std::numeric_limits<double>::infinity());
+        std::fill(used.begin(), used.end(), false);
         do{
             used[j0] = true;
             int i0 = p[j0], j1 = 0;
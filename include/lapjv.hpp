@@ -0,0 +1,159 @@
+// lapjv.hpp - single-header Jonker–Volgenant solver (dense square matrix).
+// Same interface as hungarian(); after column reduction and two rounds of
+// augmenting row reduction only a few rows are left for the (Dijkstra-style)
+// augmentation, which is what makes it faster than plain Kuhn–Munkres on
+// the larger frames.  Follows Jonker & Volgenant (1987) / gatagat's `lap`.
+#pragma once
+#include <vector>
+#include <limits>
+#include <utility>
+
+namespace lapjv_detail {
+
+using Cost = std::vector<std::vector<double>>;
+constexpr double LARGE = std::numeric_limits<double>::max();
+
+// column reduction + reduction transfer; returns #free rows
+inline int ccrrt(const Cost& c, int n, std::vector<int>& free_rows,
+                 std::vector<int>& x, std::vector<int>& y, std::vector<double>& v)
+{
+    std::vector<char> unique(n, true);
+    x.assign(n, -1); y.assign(n, 0); v.assign(n, LARGE);
+
+    for(int i=0;i<n;++i) for(int j=0;j<n;++j)
+        if(c[i][j] < v[j]) { v[j] = c[i][j]; y[j] = i; }
+
+    for(int j=n-1;j>=0;--j){
+        int i = y[j];
+        if(x[i] < 0) x[i] = j;
+        else { unique[i] = false; y[j] = -1; }
+    }
+
+    int n_free = 0;
+    for(int i=0;i<n;++i){
+        if(x[i] < 0) free_rows[n_free++] = i;
+        else if(unique[i]){
+            const int j = x[i];
+            double m = LARGE;
+            for(int j2=0;j2<n;++j2) if(j2!=j && c[i][j2]-v[j2] < m) m = c[i][j2]-v[j2];
+            v[j] -= m;
+        }
+    }
+    return n_free;
+}
+
+// augmenting row reduction; returns #rows still free
+inline int carr(const Cost& c, int n, int n_free, std::vector<int>& free_rows,
+                std::vector<int>& x, std::vector<int>& y, std::vector<double>& v)
+{
+    int current = 0, new_free = 0, rr_cnt = 0;
+
+    while(current < n_free){
+        ++rr_cnt;
+        const int free_i = free_rows[current++];
+        int    j1 = 0, j2 = -1;
+        double v1 = c[free_i][0] - v[0], v2 = LARGE;
+        for(int j=1;j<n;++j){
+            const double h = c[free_i][j] - v[j];
+            if(h < v2){
+                if(h >= v1) { v2 = h; j2 = j; }
+                else        { v2 = v1; v1 = h; j2 = j1; j1 = j; }
+            }
+        }
+        int i0 = y[j1];
+        const double v1_new    = v[j1] - (v2 - v1);
+        const bool   v1_lowers = v1_new < v[j1];
+        if(rr_cnt < current * n){
+            if(v1_lowers) v[j1] = v1_new;
+            else if(i0 >= 0 && j2 >= 0) { j1 = j2; i0 = y[j2]; }
+            if(i0 >= 0){
+                if(v1_lowers) free_rows[--current] = i0;
+                else          free_rows[new_free++] = i0;
+            }
+        }
+        else if(i0 >= 0) free_rows[new_free++] = i0;
+        x[free_i] = j1; y[j1] = free_i;
+    }
+    return new_free;
+}
+
+// shortest augmenting path from start_i; returns the free column reached
+inline int find_path(const Cost& c, int n, int start_i, const std::vector<int>& y,
+                     std::vector<double>& v, std::vector<int>& pred)
+{
+    std::vector<int>    cols(n);
+    std::vector<double> d(n);
+    for(int j=0;j<n;++j){ cols[j] = j; d[j] = c[start_i][j] - v[j]; pred[j] = start_i; }
+
+    int lo = 0, hi = 0, n_ready = 0, final_j = -1;
+    while(final_j == -1){
+        if(lo == hi){                       // collect columns at minimum distance
+            n_ready = lo;
+            double mind = d[cols[lo]];
+            hi = lo + 1;
+            for(int k=hi;k<n;++k){
+                const int j = cols[k];
+                if(d[j] <= mind){
+                    if(d[j] < mind) { hi = lo; mind = d[j]; }
+                    cols[k] = cols[hi]; cols[hi++] = j;
+                }
+            }
+            for(int k=lo;k<hi;++k) if(y[cols[k]] < 0) { final_j = cols[k]; break; }
+        }
+        if(final_j != -1) break;
+
+        while(lo != hi && final_j == -1){   // scan a column of the ready set
+            const int    jr   = cols[lo++];
+            const int    i    = y[jr];
+            const double mind = d[jr];
+            const double h    = c[i][jr] - v[jr] - mind;
+            for(int k=hi;k<n;++k){
+                const int    j   = cols[k];
+                const double red = c[i][j] - v[j] - h;
+                if(red < d[j]){
+                    d[j] = red; pred[j] = i;
+                    if(red == mind){
+                        if(y[j] < 0) { final_j = j; break; }
+                        cols[k] = cols[hi]; cols[hi++] = j;
+                    }
+                }
+            }
+        }
+    }
+    const double mind = d[final_j];         // == minimum of the last ready set
+    for(int k=0;k<n_ready;++k) { const int j = cols[k]; v[j] += d[j] - mind; }
+    return final_j;
+}
+
+} // namespace lapjv_detail
+
+// n < 0: solve the whole matrix; otherwise only its top-left n×n block
+inline int lapjv(const std::vector<std::vector<double>>& cost,
+                 std::vector<int>& rowsol,
+                 double& total_cost,
+                 int n = -1)
+{
+    using namespace lapjv_detail;
+    if(n < 0) n = cost.size();
+    rowsol.assign(n, -1);
+    total_cost = 0.0;
+    if(n == 0) return 0;
+
+    std::vector<int>    free_rows(n), y, pred(n);
+    std::vector<double> v;
+
+    int n_free = ccrrt(cost, n, free_rows, rowsol, y, v);
+    for(int it=0; n_free>0 && it<2; ++it) n_free = carr(cost, n, n_free, free_rows, rowsol, y, v);
+
+    for(int f=0; f<n_free; ++f){
+        const int free_i = free_rows[f];
+        int j = find_path(cost, n, free_i, y, v, pred), i = -1;
+        while(i != free_i){
+            i = pred[j]; y[j] = i;
+            std::swap(j, rowsol[i]);
+        }
+    }
+
+    for(int i=0;i<n;++i) total_cost += cost[i][rowsol[i]];
+    return 0;
+}
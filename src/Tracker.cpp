@@ -1,36 +1,40 @@
 #include "Tracker.hpp"
 #include "hungarian.hpp"          // minimal Hungarian solver
+#include "lapjv.hpp"              // Jonker–Volgenant, for the larger frames
 #include <algorithm>
 #include <cmath>
 #include <limits>
+#include <numeric>
 
 using namespace std;
 
+// below this size the plain Hungarian solver is just as fast
+static constexpr int LAPJV_MIN_N = 8;
+
 // ───────────────── utility helpers ──────────────────────────────────
-double Tracker::centre_dist(const Detection& d, const Track& t)
+Box Tracker::to_box(double x, double y, double w, double h)
 {
-    const double cx_d = d.x + d.w * 0.5,
-                 cy_d = d.y + d.h * 0.5;
-
-    const double cx_t = t.rect.at<double>(0) + t.rect.at<double>(2) * 0.5,
-                 cy_t = t.rect.at<double>(1) + t.rect.at<double>(3) * 0.5;
+    return { x, y, x + w, y + h,
+             x + w * 0.5, y + h * 0.5,
+             w * h };
+}
 
-    return std::hypot(cx_d - cx_t, cy_d - cy_t);
+double Tracker::centre_dist(const Box& a, const Box& b)
+{
+    return std::hypot(a.cx - b.cx, a.cy - b.cy);
 }
 
-double Tracker::iou(const Track& t, const Detection& d)
+double Tracker::iou(const Box& a, const Box& b)
 {
-    const double ax=t.rect.at<double>(0), ay=t.rect.at<double>(1),
-                 aw=t.rect.at<double>(2), ah=t.rect.at<double>(3);
-    const double bx=d.x, by=d.y, bw=d.w, bh=d.h;
+    const double x1 = std::max(a.x1,b.x1),
+                 y1 = std::max(a.y1,b.y1),
+                 x2 = std::min(a.x2,b.x2),
+                 y2 = std::min(a.y2,b.y2);
 
-    const double x1 = std::max(ax,bx),
-                 y1 = std::max(ay,by),
-                 x2 = std::min(ax+aw, bx+bw),
-                 y2 = std::min(ay+ah, by+bh);
+    if (x2 <= x1 || y2 <= y1) return 0.0;          // disjoint: nothing to weigh
 
-    const double inter = std::max(0.0,x2-x1) * std::max(0.0,y2-y1);
-    const double uni   = aw*ah + bw*bh - inter;
+    const double inter = (x2-x1) * (y2-y1);
+    const double uni   = a.area + b.area - inter;
 
     return (uni>0.0 ? inter/uni : 0.0);
 }
@@ -104,6 +108,78 @@ cv::KalmanFilter Tracker::create_kf(const Detection& d)
     return kf;
 }
 
+// ───────────────── sparse assignment ────────────────────────────────
+// Gating leaves most (track, det) pairs infeasible.  Over the padded N×N
+// matrix (BIG for gated-out pairs, 0 for dummies) the optimum is the
+// matching with the most feasible pairs, cheapest among those – and both
+// parts add up over the connected components of the feasible-pair graph.
+// So every component is solved on its own small matrix instead.
+
+static int find_root(vector<int>& parent, int i)
+{
+    while (parent[i] != i) i = parent[i] = parent[parent[i]];
+    return i;
+}
+
+void Tracker::assign_components(int nT, int nD,
+                                vector<int>& tr2det, vector<int>& det2tr)
+{
+    const double BIG = 1e9;
+
+    // union tracks (0..nT-1) and detections (nT..nT+nD-1) along edges
+    parent_.resize(nT+nD);
+    std::iota(parent_.begin(), parent_.end(), 0);
+    for (const Edge& e : edges_)
+        parent_[find_root(parent_,e.t)] = find_root(parent_,nT+e.d);
+
+    if (static_cast<int>(comp_.size()) < nT+nD) comp_.resize(nT+nD);
+    for (int r=0; r<nT+nD; ++r) comp_[r].clear();  // edge ids per root
+    for (int k=0; k<static_cast<int>(edges_.size()); ++k)
+        comp_[find_root(parent_,edges_[k].t)].push_back(k);
+
+    row_of_.assign(nT,-1); col_of_.assign(nD,-1);
+    for (int r=0; r<nT+nD; ++r)
+    {
+        const auto& ids = comp_[r];
+        if (ids.empty()) continue;
+
+        rows_.clear(); cols_.clear();
+        for (int k : ids){
+            const Edge& e = edges_[k];
+            if (row_of_[e.t] < 0) { row_of_[e.t] = rows_.size(); rows_.push_back(e.t); }
+            if (col_of_[e.d] < 0) { col_of_[e.d] = cols_.size(); cols_.push_back(e.d); }
+        }
+        const int nr = rows_.size(), nc = cols_.size(), n = std::max(nr,nc);
+
+        // grow the shared buffer if needed; only its n×n corner is used
+        if (static_cast<int>(cost_.size()) < n){
+            cost_.resize(n);
+            for (auto& row : cost_) row.resize(n);
+        }
+
+        // same layout as the full problem: BIG between real rows/cols,
+        // zeros for the dummy padding
+        for (int i=0;i<n;++i){
+            auto row = cost_[i].begin();
+            std::fill(row,    row+nc, i<nr ? BIG : 0.0);
+            std::fill(row+nc, row+n,  0.0);
+        }
+        for (int k : ids)
+            cost_[row_of_[edges_[k].t]][col_of_[edges_[k].d]] = edges_[k].cost;
+
+        double tot = 0.0;
+        if (n >= LAPJV_MIN_N) lapjv(cost_,assign_,tot,n);
+        else                  hungarian(cost_,assign_,tot,n);
+
+        for (int i=0;i<nr;++i){
+            int j = assign_[i];
+            if (j>=0 && j<nc && cost_[i][j] < BIG){
+                tr2det[rows_[i]]=cols_[j]; det2tr[cols_[j]]=rows_[i];
+            }
+        }
+    }
+}
+
 // ───────────────── constructor ──────────────────────────────────────
 Tracker::Tracker(double md,int ma,double a)
     : max_dist_(md), alpha_(a), max_age_(ma), next_id_(0) {}
@@ -130,41 +206,37 @@ std::vector<Label> Tracker::step(double ts,const vector<Detection>& dets)
         tr.time_since_update++;
     }
 
-    // ─── 2. build cost matrix ──────────────────────────────────────
+    // ─── 2. gated candidate pairs ──────────────────────────────────
     const int nT = static_cast<int>(tracks_.size());
     const int nD = static_cast<int>(dets.size());
-    const int N  = std::max(nT,nD);
-    const double BIG = 1e9;
 
-    vector<vector<double>> C(N, vector<double>(N,BIG));
+    // unpack boxes once: the pair loop below then reads flat doubles
+    // instead of going through cv::Mat::at<> N·M times
+    tbox_.resize(nT); dbox_.resize(nD);
+    for (int ti=0; ti<nT; ++ti){
+        const cv::Mat& r = tracks_[ti].rect;
+        tbox_[ti] = to_box(r.at<double>(0), r.at<double>(1),
+                        r.at<double>(2), r.at<double>(3));
+    }
+    for (int di=0; di<nD; ++di)
+        dbox_[di] = to_box(dets[di].x, dets[di].y, dets[di].w, dets[di].h);
 
+    edges_.clear();
     for (int ti=0; ti<nT; ++ti)
         for (int di=0; di<nD; ++di)
         {
-            double dist = centre_dist(dets[di], tracks_[ti]);
+            double dist = centre_dist(dbox_[di], tbox_[ti]);
             if (dist > max_dist_) continue;
 
-            double j = iou(tracks_[ti], dets[di]);
+            double j = iou(tbox_[ti], dbox_[di]);
             if (j < 0.01)         continue;
 
-            C[ti][di] = alpha_*(1.0-j) + (1.0-alpha_)*dist;
+            edges_.push_back({ ti, di, alpha_*(1.0-j) + (1.0-alpha_)*dist });
         }
 
-    // pad zeros for dummy rows/cols
-    for (int i=nT;i<N;++i) std::fill(C[i].begin(), C[i].end(), 0.0);
-    for (int i=0;i<N;++i) for (int j=nD;j<N;++j) C[i][j]=0.0;
-
-    // ─── 3. Hungarian assign ───────────────────────────────────────
-    vector<int> assign; double tot = 0.0;
-    hungarian(C,assign,tot);
-
+    // ─── 3. assign, one connected component at a time ──────────────
     vector<int> tr2det(nT,-1), det2tr(nD,-1);
-    for (int ti=0; ti<nT; ++ti){
-        int di = assign[ti];
-        if (di>=0 && di<nD && C[ti][di] < BIG){
-            tr2det[ti]=di; det2tr[di]=ti;
-        }
-    }
+    assign_components(nT, nD, tr2det, det2tr);
 
     // ─── 4. update matched ─────────────────────────────────────────
     for (int ti=0; ti<nT; ++ti){
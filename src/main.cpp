@@ -2,6 +2,7 @@
 #include <nlohmann/json.hpp>
 #include <CLI/CLI.hpp>
 #include <opencv2/opencv.hpp>
+#include <cstdio>
 #include <fstream>
 #include <iostream>
 #include <iomanip>
@@ -23,11 +24,13 @@ static std::string format_iso(double sec)
 {
     std::time_t ti = static_cast<std::time_t>(sec);
     double frac = sec - ti;
-    std::tm *tm = gmtime(&ti);
-    char buf[32]; strftime(buf,sizeof(buf),"%Y-%m-%dT%H:%M:%S",tm);
-    std::ostringstream out; out << buf << '.' << std::setw(6) << std::setfill('0')
-                                << int(frac*1e6 + 0.5);
-    return out.str();
+    std::tm tm{}; gmtime_r(&ti,&tm);
+    // fixed layout: one snprintf instead of strftime + an ostringstream
+    char buf[48];
+    std::snprintf(buf,sizeof(buf),"%04d-%02d-%02dT%02d:%02d:%02d.%06d",
+                  tm.tm_year+1900, tm.tm_mon+1, tm.tm_mday,
+                  tm.tm_hour, tm.tm_min, tm.tm_sec, int(frac*1e6 + 0.5));
+    return buf;
 }
 
 // ───────────────── INI helper ───────────────────────────────────────
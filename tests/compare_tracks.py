@@ -4,15 +4,25 @@ compare_tracks.py – Compare output tracking JSON to expected JSON,
 penalizing ID switches across frames even if exact IDs differ.
 
 Usage:
-    python compare_tracks.py expected.json output.json
+    python compare_tracks.py expected.json output.json [workers]
 """
 
 import json
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import numpy as np
-from scipy.spatial.distance import euclidean
+from scipy.spatial import cKDTree
+
+try:
+    import orjson   # optional: 2-3x faster parse than the stdlib
+except ImportError:
+    orjson = None
 
 def load_json(path):
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
     with open(path) as f:
         return json.load(f)
 
@@ -20,51 +30,71 @@ def obj_key(obj):
     """Return (x, y, w, h) tuple as the unique object key."""
     return (obj["x"], obj["y"], obj["w"], obj["h"])
 
-def find_closest_match(target, candidates, threshold=0.01):
-    """Find the closest match from candidates for a target object."""
-    tx, ty, tw, th = obj_key(target)
-    for idx, cand in enumerate(candidates):
-        cx, cy, cw, ch = obj_key(cand)
-        dist = euclidean((tx, ty, tw, th), (cx, cy, cw, ch))
-        if dist < threshold:
-            return idx
-    return -1
-
-def compare_tracks(expected, actual, threshold=0.01):
-    expected_obj_to_id = {}  # maps object key -> output track ID
-    id_switches = 0
-    seen_keys = set()
-
-    for frame_idx, (exp_frame, act_frame) in enumerate(zip(expected, actual)):
-        exp_objs = exp_frame.get("tracks", [])
-        act_objs = act_frame.get("tracks", [])
-
-        for exp_obj in exp_objs:
-            key = obj_key(exp_obj)
-            match_idx = find_closest_match(exp_obj, act_objs, threshold)
-            if match_idx == -1:
-                continue  # can't match this expected object
-
-            out_id = act_objs[match_idx]["id"]
-            if key in expected_obj_to_id:
-                if expected_obj_to_id[key] != out_id:
-                    id_switches += 1  # this object was tracked by a different ID
-            else:
-                expected_obj_to_id[key] = out_id
-
-            seen_keys.add(key)
+def obj_array(objs):
+    """Stack the object keys of a frame into an (N, 4) float array."""
+    return np.array([obj_key(o) for o in objs], dtype=float).reshape(-1, 4)
+
+def match_frame(exp_arr, act_arr, threshold=0.01):
+    """Find the closest actual object for every expected object of a frame.
+
+    Both arguments are (N, 4) arrays from obj_array(); a KD-tree over the
+    actual objects makes this O((N+M) log M).  Returns one index into
+    act_arr per expected object, or -1 where nothing is within threshold.
+    """
+    if len(exp_arr) == 0 or len(act_arr) == 0:
+        return np.full(len(exp_arr), -1)
+    dists, idxs = cKDTree(act_arr).query(
+        exp_arr, k=1, distance_upper_bound=threshold)
+    idxs[~(dists < threshold)] = -1
+    return idxs
+
+def compare_tracks(expected, actual, threshold=0.01, workers=1):
+    exp_frames = [f.get("tracks", []) for f in expected]
+    act_frames = [f.get("tracks", []) for f in actual]
+
+    # pass 1: matching a frame needs nothing from any other frame, so it
+    # can be farmed out to worker processes (only the arrays are pickled)
+    exp_arrs = list(map(obj_array, exp_frames))
+    act_arrs = map(obj_array, act_frames)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            matches = list(ex.map(match_frame, exp_arrs, act_arrs,
+                                  repeat(threshold), chunksize=32))
+    else:
+        matches = list(map(match_frame, exp_arrs, act_arrs, repeat(threshold)))
+
+    # pass 2: the id bookkeeping is the only cross-frame state.  Every
+    # matched (expected key, output id) pair is laid out in frame order;
+    # a key keeps the id it was first matched to, and every later match
+    # to a different id is a switch.
+    keys, out_ids = [], []
+    for exp_arr, act_objs, frame_matches in zip(exp_arrs, act_frames, matches):
+        hit = frame_matches != -1
+        keys.append(exp_arr[hit])
+        out_ids.extend(act_objs[i]["id"] for i in frame_matches[hit])
+
+    if out_ids:
+        _, first, key_idx = np.unique(np.concatenate(keys), axis=0,
+                                      return_index=True, return_inverse=True)
+        out_ids = np.array(out_ids)
+        key_idx = key_idx.reshape(-1)   # numpy 2.0.x returns it 2-D
+        id_switches = int(np.count_nonzero(out_ids != out_ids[first][key_idx]))
+        tracked = len(first)
+    else:
+        id_switches = tracked = 0
 
     return {
         "frames_compared": len(expected),
-        "tracked_objects": len(seen_keys),
+        "tracked_objects": tracked,
         "id_switches": id_switches,
     }
 
 def main():
 
-    if len(sys.argv) != 3:
-        print("Usage: python compare_tracks.py expected.json output.json")
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python compare_tracks.py expected.json output.json [workers]")
         sys.exit(1)
+    workers = int(sys.argv[3]) if len(sys.argv) == 4 else 1
 
     expected = load_json(sys.argv[1])
     actual = load_json(sys.argv[2])
@@ -73,7 +103,7 @@ def main():
         print("Frame count mismatch")
         sys.exit(1)
 
-    results = compare_tracks(expected, actual)
+    results = compare_tracks(expected, actual, workers=workers)
     print("Comparison Results:")
     for k, v in results.items():
         print(f"{k}: {v}")
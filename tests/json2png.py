@@ -19,26 +19,67 @@ Usage
 -----
 python json2png.py --input detections.json --out-dir vis \
                    --width 800 --height 600 \
+                   --format png \
                    --id-field tracks        # or detections
 
+python json2png.py --input tracks.json --video tracks.mp4   # one video file
+
+python json2png.py ... --shard 2/8   # this host renders frames with idx % 8 == 2
+
 Dependencies
 ------------
 pip install opencv-python
+pip install numba            # optional: --jit box-drawing kernel
+pip install orjson           # optional: faster parse of the whole input
+pip install ijson            # optional: stream inputs too big to load at once
+ffmpeg on PATH               # only for --video
 """
 
-import argparse, json, os, cv2, numpy as np
+import argparse, functools, itertools, json, os, queue, subprocess, sys
+import threading
+from collections import deque
+import cv2, numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson   # optional JSON parser
+except ImportError:
+    orjson = None
+
+try:
+    import ijson    # optional: incremental parse, O(1 frame) memory
+except ImportError:
+    ijson = None
+
+STREAM_BYTES = 256 << 20    # stream inputs larger than this when ijson is there
+
 # ---------------------------------------------------------------------------
 
+def shard_arg(text):
+    """'i/N' -> (i, N) with 0 <= i < N."""
+    try:
+        i, n = map(int, text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, got {text!r}")
+    if not 0 <= i < n:
+        raise argparse.ArgumentTypeError(f"need 0 <= i < N, got {text!r}")
+    return i, n
+
 def parse_args():
     p = argparse.ArgumentParser(
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
-        description="Render bounding boxes from JSON to PNGs")
+        description="Render bounding boxes from JSON to images")
     p.add_argument("--input",   "-i", required=True,
                    help="JSON file with 'detections' or 'tracks'")
-    p.add_argument("--out-dir", "-o", required=True,
-                   help="output directory for PNGs")
+    out = p.add_mutually_exclusive_group(required=True)
+    out.add_argument("--out-dir", "-o",
+                     help="output directory for the images")
+    out.add_argument("--video",
+                     help="write a single video file through ffmpeg instead "
+                          "(codec follows the extension, e.g. .mp4, .webm)")
+    p.add_argument("--fps", type=float, default=30,
+                   help="frame rate for --video")
     p.add_argument("--width",   "-W", type=int, default=800,
                    help="output image width")
     p.add_argument("--height",  "-H", type=int, default=600,
@@ -48,62 +89,328 @@ def parse_args():
                    help="which list to read from each frame object")
     p.add_argument("--font-scale", type=float, default=0.5,
                    help="OpenCV font scale for IDs")
-    return p.parse_args()
+    p.add_argument("--jit", action="store_true",
+                   help="draw boxes with a numba kernel")
+    p.add_argument("--aa", action=argparse.BooleanOptionalAction,
+                   default=False,
+                   help="anti-alias the ID labels (smoother, slower text); "
+                        "off by default since these are debug renders")
+    p.add_argument("--format", choices=["png", "jpg", "webp", "ppm"],
+                   default="png",
+                   help="image format; jpg/webp encode much faster than png, "
+                        "ppm is raw (e.g. to pipe into ffmpeg)")
+    p.add_argument("--png-level", type=int, default=None, choices=range(10),
+                   metavar="0-9",
+                   help="zlib level for png; unset keeps OpenCV's default "
+                        "(fastest level, RLE strategy), which is about twice "
+                        "as fast as any explicit level")
+    p.add_argument("--workers", "-j", type=int, default=os.cpu_count() or 1,
+                   help="render processes (1 = render in this process)")
+    p.add_argument("--shard", type=shard_arg, default="0/1", metavar="i/N",
+                   help="only render frames with index %% N == i, so N "
+                        "machines can split a run between them")
+    args = p.parse_args()
+    if args.video is not None and args.shard[1] > 1:
+        p.error("--shard splits image output; it cannot be used with --video")
+    return args
 
 # ---------------------------------------------------------------------------
 
-def draw_frame(objs, img_w, img_h, font_scale):
+def frame_arrays(objs):
+    """
+    Split one frame's object dicts into SoA form: xs, ys, ws, hs as float
+    arrays plus the id labels (None if no object carries an 'id').
+    """
+    box = np.array([(o["x"], o["y"], o["w"], o["h"]) for o in objs],
+                   dtype=np.float64).reshape(-1, 4)
+    xs, ys, ws, hs = np.ascontiguousarray(box.T)
+    ids = [str(o["id"]) if "id" in o else None for o in objs]
+    if not any(i is not None for i in ids):
+        ids = None
+    return xs, ys, ws, hs, ids
+
+BOX_COLOR = (0, 255, 0)
+
+@functools.lru_cache(maxsize=4096)
+def text_size(text, font_scale):
+    """(w, h) of a label; track ids repeat across frames, so memoise."""
+    return cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, 1)[0]
+
+def draw_boxes_cv(img, px, py, x1, y1):
+    """All boxes as closed 4-point polylines in a single OpenCV call."""
+    # corner order is the one cv2.rectangle uses internally, so the pixels
+    # are the same as a thickness-2 rectangle per box
+    if len(px):
+        polys = np.stack([px, py, x1, py, x1, y1, px, y1], axis=1)
+        cv2.polylines(img, polys.reshape(-1, 4, 2), True, BOX_COLOR, 2,
+                      cv2.LINE_8)
+
+def _fill_band(img, r0, r1, c0, c1):
+    h, w = img.shape[0], img.shape[1]
+    r0 = min(max(r0, 0), h); r1 = min(max(r1, 0), h)
+    c0 = min(max(c0, 0), w); c1 = min(max(c1, 0), w)
+    for r in range(r0, r1):
+        for c in range(c0, c1):
+            img[r, c, 0] = BOX_COLOR[0]
+            img[r, c, 1] = BOX_COLOR[1]
+            img[r, c, 2] = BOX_COLOR[2]
+
+def draw_boxes_nb(img, px, py, x1, y1):
+    """
+    Same pixels as draw_boxes_cv: a thickness-2 rectangle is four 3-px
+    bands centred on its edges, each spanning only the other edges'
+    extent (which is what rounds the outer corners).  Only meant to run
+    compiled, see use_jit_boxes().
+    """
+    for i in range(px.shape[0]):
+        x, y, xe, ye = int(px[i]), int(py[i]), int(x1[i]), int(y1[i])
+        _fill_band(img, y - 1, y + 2, x, xe + 1)        # top
+        _fill_band(img, ye - 1, ye + 2, x, xe + 1)      # bottom
+        _fill_band(img, y, ye + 1, x - 1, x + 2)        # left
+        _fill_band(img, y, ye + 1, xe - 1, xe + 2)      # right
+
+draw_boxes = draw_boxes_cv
+
+def use_jit_boxes():
+    """
+    Switch draw_boxes to the numba kernel (--jit) in this process; False
+    if numba is missing.  Importing numba and loading the cached kernel
+    costs ~0.6 s per process and saves ~78 us a frame, so a worker needs
+    ~7.7k frames to break even.
+    """
+    global draw_boxes, _fill_band
+    try:
+        from numba import njit
+    except ImportError:
+        return False
+    if not hasattr(_fill_band, "py_func"):  # resolved when the caller compiles
+        _fill_band = njit(cache=True)(_fill_band)
+    draw_boxes = njit(cache=True)(draw_boxes_nb)
+    return True
+
+def draw_frame(img, xs, ys, ws, hs, ids, font_scale, line_type=cv2.LINE_8):
     """
-    Paint each bbox, and if the dict contains 'id', print it in the top-left above the box.
+    Clear img and paint each bbox, and if it has an id, print it in the
+    top-left above the box.  img is an (H, W, 3) uint8 canvas that the
+    caller reuses from frame to frame; line_type is the label line type
+    (LINE_8 by default, LINE_AA for smoother but slower text).
     """
-    img = np.full((img_h, img_w, 3), 30, dtype=np.uint8)
+    img_h, img_w = img.shape[:2]
+    img.fill(30)
 
-    for obj in objs:
-        x = int(obj["x"] * img_w)
-        y = int(obj["y"] * img_h)
-        w = int(obj["w"] * img_w)
-        h = int(obj["h"] * img_h)
+    # float64 and truncation match int(v * size)
+    px = (xs * img_w).astype(np.int32)
+    py = (ys * img_h).astype(np.int32)
+    x1 = px + (ws * img_w).astype(np.int32)
+    y1 = py + (hs * img_h).astype(np.int32)
 
-        cv2.rectangle(img, (x, y), (x + w, y + h), (0, 255, 0), 2)
+    draw_boxes(img, px, py, x1, y1)
 
-        if "id" in obj:
-            text = str(obj["id"])
-            (tw, th), _ = cv2.getTextSize(
-                text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, 1)
+    # labels go on top of every box, so a later box never hides one
+    if ids is not None:
+        for text, x, y in zip(ids, px.tolist(), py.tolist()):
+            if text is None:
+                continue
+            tw, th = text_size(text, font_scale)
             text_x = x + 2
             text_y = max(y - 4, th + 2)  # prevent going above image top
             cv2.putText(
                 img, text, (text_x, text_y),
                 cv2.FONT_HERSHEY_SIMPLEX, font_scale,
-                (0, 255, 255), 1, cv2.LINE_AA)
+                (0, 255, 255), 1, line_type)
 
     return img
 
+def iter_frames(path):
+    """
+    Yield the frame objects of a JSON array one at a time.  Typical inputs
+    are parsed in one go (orjson when available, about twice as fast as
+    ijson); big ones are streamed so they never sit in memory whole.
+    """
+    if ijson is not None and os.path.getsize(path) > STREAM_BYTES:
+        with open(path, "rb") as f:
+            yield from ijson.items(f, "item", use_float=True)
+    elif orjson is not None:
+        with open(path, "rb") as f:
+            yield from orjson.loads(f.read())
+    else:
+        with open(path) as f:
+            yield from json.load(f)
+
+LOSSY_QUALITY = 85  # jpg / webp quality
+
+def write_params(fmt, png_level):
+    """cv2.imwrite flags for the chosen output format."""
+    if fmt == "png":
+        # any explicit level also drops OpenCV's default RLE strategy
+        if png_level is None:
+            return []
+        return [cv2.IMWRITE_PNG_COMPRESSION, png_level]
+    if fmt == "jpg":
+        return [cv2.IMWRITE_JPEG_QUALITY, LOSSY_QUALITY]
+    if fmt == "ppm":
+        return [cv2.IMWRITE_PXM_BINARY, 1]     # P6: header + raw pixels
+    return [cv2.IMWRITE_WEBP_QUALITY, LOSSY_QUALITY]
+
+_canvas = None      # per-process drawing buffer, see _render_one
+
+def _init_worker(jit=False):
+    # one OpenCV thread per process, or its own pool fights ours for cores
+    cv2.setNumThreads(1)
+    if jit:
+        use_jit_boxes()
+
+def _render_one(task):
+    """Draw and write one frame; top-level so the process pool can pickle it."""
+    global _canvas
+    out_path, arrays, img_w, img_h, label, params = task
+    if _canvas is None or _canvas.shape[:2] != (img_h, img_w):
+        _canvas = np.empty((img_h, img_w, 3), dtype=np.uint8)
+    draw_frame(_canvas, *arrays, *label)
+    cv2.imwrite(out_path, _canvas, params)
+
+def _render_batch(batch):
+    """Render a list of tasks; the unit of work handed to a pool worker."""
+    for task in batch:
+        _render_one(task)
+    return len(batch)
+
+def render_pool(tasks, workers, jit, batch=16):
+    """
+    Render through a process pool with at most 2*workers batches in
+    flight, so a streamed input is only read a bounded distance ahead of
+    the renderers (Executor.map would drain the whole generator up front).
+    Returns the frame count.
+    """
+    n, pending, tasks = 0, deque(), iter(tasks)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(jit,)) as ex:
+        while chunk := list(itertools.islice(tasks, batch)):
+            if len(pending) >= 2 * workers:
+                n += pending.popleft().result()
+            pending.append(ex.submit(_render_batch, chunk))
+        n += sum(f.result() for f in pending)
+    return n
+
+def render_serial(tasks, depth=4):
+    """
+    Render in this thread while a writer thread encodes earlier frames
+    (imwrite drops the GIL).  up to `depth` canvases circulate between
+    the two, so frames are never copied; returns the frame count.
+    """
+    todo, free, errors = queue.Queue(), queue.Queue(), []
+
+    def writer():
+        while (item := todo.get()) is not None:
+            path, img, params = item
+            try:
+                cv2.imwrite(path, img, params)
+            except Exception as e:          # re-raised in the caller
+                errors.append(e)
+            free.put(img)
 
+    t = threading.Thread(target=writer, daemon=True)
+    t.start()
+    n, n_bufs = 0, 0
+    try:
+        for out_path, arrays, img_w, img_h, label, params in tasks:
+            if n_bufs < depth:
+                img = np.empty((img_h, img_w, 3), dtype=np.uint8)
+                n_bufs += 1
+            else:
+                img = free.get()            # blocks while all are queued
+            draw_frame(img, *arrays, *label)
+            todo.put((out_path, img, params))
+            n += 1
+    finally:
+        todo.put(None)
+        t.join()
+    if errors:
+        raise errors[0]
+    return n
 
+def render_video(tasks, path, img_w, img_h, fps):
+    """
+    Pipe raw BGR frames into one ffmpeg process, which encodes them
+    alongside the drawing; returns the frame count.
+    """
+    cmd = ["ffmpeg", "-y", "-loglevel", "error",
+           "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{img_w}x{img_h}",
+           "-r", str(fps), "-i", "-",
+           "-pix_fmt", "yuv420p", path]
+    try:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    except FileNotFoundError:
+        sys.exit("--video needs ffmpeg on PATH")
+
+    img = np.empty((img_h, img_w, 3), dtype=np.uint8)
+    n = 0
+    try:
+        for _, arrays, _, _, label, _ in tasks:
+            draw_frame(img, *arrays, *label)
+            proc.stdin.write(img.data)
+            n += 1
+    except BrokenPipeError:
+        pass                                # ffmpeg failed; reported below
+    finally:
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        rc = proc.wait()
+    if rc != 0:
+        sys.exit(f"ffmpeg exited with status {rc}")
+    return n
 
 # ---------------------------------------------------------------------------
 
 def main():
     args = parse_args()
-    Path(args.out_dir).mkdir(parents=True, exist_ok=True)
+    if args.out_dir is not None:
+        Path(args.out_dir).mkdir(parents=True, exist_ok=True)
+
+    params = write_params(args.format, args.png_level)
+    if args.jit and not use_jit_boxes():
+        print("--jit: numba not installed, drawing with cv2.polylines")
+        args.jit = False
+
+    # output names are plain string formatting; no Path objects per frame
+    out_dir = None if args.out_dir is None else str(Path(args.out_dir))
+    ext = args.format
+    label = (args.font_scale, cv2.LINE_AA if args.aa else cv2.LINE_8)
 
-    with open(args.input) as f:
-        frames = json.load(f)
+    # frames are parsed as they stream in and turned into arrays straight
+    # away; those are also far cheaper to ship to the workers than dicts
+    shard, n_shards = args.shard
 
-    for idx, frame in enumerate(frames):
-        objs = frame.get(args.id_field, [])
-        # fall back to "detections" if we asked for "tracks" but it's absent
-        if args.id_field == "tracks" and not objs:
-            objs = frame.get("detections", [])
-        has_ids = (args.id_field == "tracks")
-        img = draw_frame(objs, args.width, args.height, args.font_scale)
+    def tasks():
+        for idx, frame in enumerate(iter_frames(args.input)):
+            if idx % n_shards != shard:
+                continue                    # another shard's frame
+            objs = frame.get(args.id_field, [])
+            # fall back to "detections" if we asked for "tracks" but it's absent
+            if args.id_field == "tracks" and not objs:
+                objs = frame.get("detections", [])
+            out_name = None                 # --video: nothing per frame
+            if out_dir is not None:
+                out_name = f"{out_dir}{os.sep}frame_{idx:04d}.{ext}"
+            yield (out_name, frame_arrays(objs),
+                   args.width, args.height, label, params)
 
+    if args.video is not None:
+        n_frames = render_video(tasks(), args.video,
+                                args.width, args.height, args.fps)
+        print(f"Wrote {n_frames} frames to {args.video}")
+        return
 
-        out_name = Path(args.out_dir) / f"frame_{idx:04d}.png"
-        cv2.imwrite(out_name.as_posix(), img)
+    # frames share no state, so each one is rendered (and, mostly,
+    # encoded) in whichever worker picks it up
+    if args.workers > 1:
+        n_frames = render_pool(tasks(), args.workers, args.jit)
+    else:
+        n_frames = render_serial(tasks())
 
-    print(f"Wrote {len(frames)} PNGs to {args.out_dir}")
+    print(f"Wrote {n_frames} {args.format.upper()}s to {args.out_dir}")
 
 # ---------------------------------------------------------------------------
 